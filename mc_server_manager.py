@@ -34,16 +34,28 @@ STATUS_POLL_INTERVAL = 5    # 状态轮询间隔（秒）
 
 import os
 import sys
+import errno
 import json
+import atexit
+import collections
+import queue
+import mmap
+import codecs
+import selectors
+import concurrent.futures
+import itertools
 import subprocess
 import shutil
 import urllib.request
 import time
 import signal
+import socket
 import threading
 import hashlib
 import secrets
 import base64
+import zipfile
+import operator
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -60,6 +72,12 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class Colors:
     """终端颜色定义"""
@@ -73,14 +91,55 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# 日志级别对应的控制台样式：(颜色, 消息前缀)，未列出的级别不加颜色
+LOG_LEVEL_STYLES = {
+    "error": (Colors.FAIL, ""),
+    "success": (Colors.OKGREEN, ""),
+    "info": (Colors.OKCYAN, ""),
+    "command": (Colors.WARNING, "命令: "),
+}
+
+
+def dumps_json_line(obj) -> bytes:
+    """将对象序列化为一行紧凑JSON（UTF-8编码，以换行结尾），优先使用 orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+
 class MCServerManager:
     """Minecraft Fabric服务器管理器"""
     
+    # 持久化输出刷新策略：累计条数或距上次写盘时间任一达到阈值即写盘
+    OUTPUT_FLUSH_BATCH = 50
+    OUTPUT_FLUSH_INTERVAL = 2.0
+    # 命令输出队列保留的最大条数（界面长时间不轮询时也不会无限增长）
+    COMMAND_OUTPUT_MAX = 500
+    # 持久化输出文件超过该行数时压缩为最近 COMMAND_OUTPUT_MAX 条
+    OUTPUT_COMPACT_LINES = 1000
+    # 日志写入线程每批最多处理的条数
+    LOG_WRITE_BATCH = 64
+    # 配置文件修改后延迟写盘的时间（秒），期间的多次修改合并为一次写入
+    CONFIG_FLUSH_DELAY = 0.2
+    # Minecraft版本列表缓存有效期（秒）
+    MC_VERSIONS_CACHE_TTL = 24 * 3600
+    # 时间同步等短命令的超时时间（秒）
+    QUICK_COMMAND_TIMEOUT = 10
+    # get_new_logs 单次最多读取的积压字节数，超出时只返回末尾 SERVER_LOG_LINES 行
+    NEW_LOGS_MAX_BYTES = 1 << 20
+    # 备份时预读文件的线程数和最多预读（尚未写入压缩包）的文件数
+    BACKUP_READ_WORKERS = 8
+    BACKUP_READ_AHEAD = 32
+    # 备份时不再压缩的文件类型（内容已经过压缩）
+    BACKUP_STORED_EXTENSIONS = {'.mca', '.mcc', '.zip', '.png', '.jar', '.gz'}
+    
     def __init__(self, server_dir: str = None):
         """初始化管理器"""
         self.server_dir = Path(server_dir) if server_dir else Path.cwd()
         self.server_process = None
         self.server_lock = threading.Lock()
+        # 服务器内存分配（总内存的70%，无psutil时默认2048MB），进程运行期间不变，只计算一次
+        self._heap_size_mb = int(psutil.virtual_memory().total * 0.7 / 1024 / 1024) if PSUTIL_AVAILABLE else 2048
         self.config_file = self.server_dir / "server.properties"
         self.whitelist_file = self.server_dir / "whitelist.json"
         self.ops_file = self.server_dir / "ops.json"
@@ -89,6 +148,8 @@ class MCServerManager:
         self.mods_dir = self.server_dir / "mods"
         self.logs_dir = self.server_dir / "logs"
         self.backups_dir = self.server_dir / "backups"
+        self.unified_log_file = self.logs_dir / "unified.log"
+        self.mc_versions_cache_file = self.server_dir / ".mc_versions.cache.json"
         
         # 创建必要的目录
         self.mods_dir.mkdir(exist_ok=True)
@@ -101,17 +162,80 @@ class MCServerManager:
         self.banned_players = self._load_json(self.banned_players_file, [])
         self.banned_ips = self._load_json(self.banned_ips_file, [])
         
+        # 配置文件延迟写盘：修改后只标记为脏，由后台线程合并写入
+        self._config_savers = {
+            'properties': self._save_properties,
+            'whitelist': lambda: self._save_json(self.whitelist_file, self.whitelist),
+            'ops': lambda: self._save_json(self.ops_file, self.ops),
+            'banned_players': lambda: self._save_json(self.banned_players_file, self.banned_players),
+            'banned_ips': lambda: self._save_json(self.banned_ips_file, self.banned_ips),
+        }
+        self._dirty_configs = set()
+        self._dirty_configs_lock = threading.Lock()
+        self._config_save_lock = threading.Lock()
+        self._config_flush_event = threading.Event()
+        self._config_writer = threading.Thread(target=self._config_flush_loop, daemon=True)
+        self._config_writer.start()
+        atexit.register(self.flush_config_files)
+        
+        # 名单索引（玩家名小写 / IP -> 条目），与上面的列表同步维护
+        self._whitelist_idx = self._build_name_index(self.whitelist)
+        self._ops_idx = self._build_name_index(self.ops)
+        self._banned_players_idx = self._build_name_index(self.banned_players)
+        self._banned_ips_idx = {entry['ip']: entry for entry in self.banned_ips}
+        
+        # Minecraft版本列表缓存 (获取时间, 版本列表)
+        self._mc_versions_cache = None
+        
+        # mod/备份列表缓存 (目录mtime_ns, 列表)，目录变化或本程序修改后失效
+        self._mods_cache = None
+        self._backups_cache = None
+        
+        # 数据版本号（白名单/管理员/封禁/mod/备份），内容变化时更新，用于HTTP ETag
+        self._data_version_counter = itertools.count(1)
+        self._data_versions: Dict[str, int] = {}
+        
         # 日志监控
         self.log_watcher_active = False
         self.log_position = 0
+        # 统一日志写入序号：每次写入后递增，get_new_logs 据此跳过无新内容时的文件读取
+        self._unified_log_seq = 0
+        self._new_logs_seen_seq = -1
+        
+        # 日志时间戳缓存 (整秒时间, "HH:MM:SS")
+        self._ts_cache = (0, "")
+        
+        # 统一日志文件句柄（首次写入时打开，保持打开状态）
+        self._unified_log_fp = None
+        self._unified_log_ino = None
+        self._unified_log_lock = threading.Lock()
+        atexit.register(self._close_unified_log)
         
         # 命令输出队列（持久化）
-        self.command_output_queue = []
+        self.command_output_queue = collections.deque(maxlen=self.COMMAND_OUTPUT_MAX)
         self.command_output_lock = threading.Lock()
+        self.persistent_output_file = self.server_dir / ".persistent_output.jsonl"
+        self._output_save_lock = threading.Lock()
+        self._pending_output = []
+        self._persisted_line_count = 0
+        self._last_output_flush = time.time()
         
         # 加载持久化的输出
         self._load_persistent_output()
         
+        atexit.register(self.flush_persistent_output)
+        
+        # 后台日志写入线程：控制台输出、统一日志和持久化输出均由其批量完成
+        self._log_q = queue.Queue()
+        self._log_writer = threading.Thread(target=self._log_writer_loop, daemon=True)
+        self._log_writer.start()
+        atexit.register(self._stop_log_writer)
+        
+        # 后台命令写入线程：所有发往服务器 stdin 的命令由其串行写入，避免并发写入交错
+        self._cmd_q = queue.Queue()
+        self._cmd_writer = threading.Thread(target=self._command_writer_loop, daemon=True)
+        self._cmd_writer.start()
+        
         # 时间同步
         self.time_sync_enabled = True
         self.time_sync_interval = 3600  # 每小时同步一次（秒）
@@ -135,11 +259,55 @@ class MCServerManager:
     def _save_properties(self):
         """保存server.properties文件"""
         with open(self.config_file, 'w', encoding='utf-8') as f:
-            for key, value in self.properties.items():
+            for key, value in list(self.properties.items()):
                 f.write(f"{key}={value}\n")
     
+    def _mark_config_dirty(self, name: str):
+        """标记配置文件已修改，由后台线程在短暂延迟后写盘"""
+        with self._dirty_configs_lock:
+            self._dirty_configs.add(name)
+        self._bump_data_version(name)
+        self._config_flush_event.set()
+    
+    def _bump_data_version(self, name: str):
+        """更新数据版本号（全局单调递增，不会与之前的版本号重复）"""
+        self._data_versions[name] = next(self._data_version_counter)
+    
+    def data_version(self, name: str) -> int:
+        """获取数据当前版本号"""
+        return self._data_versions.get(name, 0)
+    
+    def _config_flush_loop(self):
+        """后台配置写盘线程：等待修改，稍作延迟以合并连续修改后统一写入"""
+        while True:
+            self._config_flush_event.wait()
+            time.sleep(self.CONFIG_FLUSH_DELAY)
+            self._config_flush_event.clear()
+            self.flush_config_files()
+    
+    def flush_config_files(self, names: List[str] = None):
+        """立即写入已修改的配置文件（names 为空时写入全部）"""
+        with self._config_save_lock:
+            with self._dirty_configs_lock:
+                if names is None:
+                    dirty = self._dirty_configs
+                    self._dirty_configs = set()
+                else:
+                    dirty = self._dirty_configs & set(names)
+                    self._dirty_configs -= dirty
+            
+            for name in dirty:
+                try:
+                    self._config_savers[name]()
+                except Exception as e:
+                    print(f"{Colors.WARNING}保存配置文件失败 ({name}): {e}{Colors.ENDC}")
+    
+    def commit_properties(self):
+        """立即将已修改的配置写入server.properties"""
+        self.flush_config_files(['properties'])
+    
     def update_property(self, key: str, value: str) -> Dict:
-        """更新服务器配置属性"""
+        """更新服务器配置属性（延迟写盘，需立即生效时调用 commit_properties）"""
         result = {"success": False, "message": ""}
         
         if key not in self.properties:
@@ -147,12 +315,29 @@ class MCServerManager:
             return result
         
         self.properties[key] = value
-        self._save_properties()
+        self._mark_config_dirty('properties')
         
         result["success"] = True
-        result["message"] = f"配置项 {key} 已更新为 {value}"
+        result["message"] = f"配置 {key} 已更新为 {value}"
         return result
     
+    def update_properties(self, updates: Dict[str, str]) -> List[Dict]:
+        """批量更新服务器配置属性：先校验全部配置项，再统一修改并只写盘一次，返回每项的结果"""
+        results = []
+        valid = {}
+        for key, value in updates.items():
+            if key in self.properties:
+                valid[key] = value
+                results.append({"success": True, "message": f"配置 {key} 已更新为 {value}"})
+            else:
+                results.append({"success": False, "message": f"配置项 {key} 不存在"})
+        
+        if valid:
+            self.properties.update(valid)
+            self._mark_config_dirty('properties')
+            self.commit_properties()
+        return results
+    
     def _load_json(self, file_path: Path, default):
         """加载JSON文件"""
         if file_path.exists():
@@ -163,60 +348,188 @@ class MCServerManager:
                 return default
         return default
     
+    @staticmethod
+    def _build_name_index(entries: List[Dict]) -> Dict[str, Dict]:
+        """为玩家名单建立索引（玩家名小写 -> 条目）"""
+        name_key = MCServerManager._name_key
+        return {name_key(entry['name']): entry for entry in entries}
+    
+    @staticmethod
+    def _name_key(player_name: str) -> str:
+        """玩家名索引键（不区分大小写），加载和查询统一使用，每次操作只计算一次"""
+        return player_name.lower()
+    
+    @staticmethod
+    def _remove_entry(entries: List[Dict], entry: Dict):
+        """按对象身份从名单中移除条目（避免 list.remove 对每个字典逐字段比较）"""
+        for i, item in enumerate(entries):
+            if item is entry:
+                del entries[i]
+                return
+    
     def _save_json(self, file_path: Path, data):
         """保存JSON文件"""
+        if ORJSON_AVAILABLE:
+            # 一次性生成UTF-8字节并写入，不经过中间字符串
+            file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            return
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
     
-    def _format_log_message(self, message: str) -> str:
+    @staticmethod
+    def _format_log_message(message: str) -> str:
         """格式化日志消息，保留所有原始输出"""
-        import re
-        
         # 不进行任何格式化，直接返回原始消息
         # 这样可以显示所有终端输出内容
+        # 如需重新加入过滤，请在模块级预编译正则，或用 str.startswith/find 直接扫描
         return message
     
+    def _now_hms(self) -> str:
+        """返回当前时间的 HH:MM:SS 字符串，同一秒内复用已格式化的结果"""
+        now = int(time.time())
+        cache = self._ts_cache
+        if cache[0] != now:
+            cache = self._ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        return cache[1]
+    
     def _log_command_output(self, message: str, level: str = "output"):
         """记录命令输出到队列、控制台和日志文件"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        self._log_command_output_many([message], level)
+    
+    def _log_command_output_many(self, messages: List[str], level: str = "output"):
+        """批量记录多条命令输出（共用一个时间戳，只加锁一次）"""
+        timestamp = self._now_hms()
         
         # 格式化消息（移除 Minecraft 服务器日志中的冗余信息）
-        formatted_message = self._format_log_message(message)
-        
-        output = {
+        outputs = [{
             "timestamp": timestamp,
-            "message": formatted_message,
+            "message": self._format_log_message(message),
             "level": level
-        }
-        
-        # 输出到控制台（带颜色）
-        if level == "error":
-            print(f"{Colors.FAIL}[{timestamp}] {formatted_message}{Colors.ENDC}")
-        elif level == "success":
-            print(f"{Colors.OKGREEN}[{timestamp}] {formatted_message}{Colors.ENDC}")
-        elif level == "info":
-            print(f"{Colors.OKCYAN}[{timestamp}] {formatted_message}{Colors.ENDC}")
-        elif level == "command":
-            print(f"{Colors.WARNING}[{timestamp}] 命令: {formatted_message}{Colors.ENDC}")
-        else:
-            print(f"[{timestamp}] {formatted_message}")
+        } for message in messages]
         
         # 添加到队列
         with self.command_output_lock:
-            self.command_output_queue.append(output)
-            # 限制队列大小，保留最近500条
-            if len(self.command_output_queue) > 500:
-                self.command_output_queue = self.command_output_queue[-500:]
-        
-        # 保存到持久化文件
-        self._save_persistent_output()
-        
-        # 保存到统一日志文件（带颜色标记）
-        self._save_to_unified_log(timestamp, formatted_message, level)
+            # 队列有长度上限，自动只保留最近500条
+            self.command_output_queue.extend(outputs)
+            self._pending_output.extend(outputs)
+        
+        # 控制台输出、统一日志和持久化交给后台写入线程
+        for output in outputs:
+            self._log_q.put((timestamp, output["message"], level, False))
+    
+    @staticmethod
+    def _format_console_line(timestamp: str, message: str, level: str, from_server: bool) -> str:
+        """格式化一行控制台输出（带颜色）"""
+        if from_server:
+            return f"[SERVER] {message}\n"
+        style = LOG_LEVEL_STYLES.get(level)
+        if style is None:
+            return f"[{timestamp}] {message}\n"
+        color, label = style
+        return f"{color}[{timestamp}] {label}{message}{Colors.ENDC}\n"
+    
+    def _log_writer_loop(self):
+        """后台日志写入线程：批量取出日志条目并一次性写盘"""
+        while True:
+            try:
+                batch = [self._log_q.get(timeout=self.OUTPUT_FLUSH_INTERVAL)]
+            except queue.Empty:
+                batch = []
+            try:
+                while len(batch) < self.LOG_WRITE_BATCH:
+                    batch.append(self._log_q.get_nowait())
+            except queue.Empty:
+                pass
+            
+            stopping = None in batch
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                if entries:
+                    self._write_unified_log_lines(
+                        [f"[{timestamp}] [{level.upper()}] {message}\n"
+                         for timestamp, message, level, _ in entries])
+                
+                # 持久化输出按条数或时间间隔批量写盘
+                if self._pending_output and (
+                        stopping or
+                        len(self._pending_output) >= self.OUTPUT_FLUSH_BATCH or
+                        time.time() - self._last_output_flush > self.OUTPUT_FLUSH_INTERVAL):
+                    self._save_persistent_output()
+            except Exception as e:
+                print(f"{Colors.WARNING}写入日志失败: {e}{Colors.ENDC}")
+            
+            if entries:
+                # 整批日志合并为一次控制台写入；与写盘分开处理，控制台不可用时日志仍会保存
+                try:
+                    sys.stdout.write(''.join(self._format_console_line(*entry) for entry in entries))
+                    sys.stdout.flush()
+                except Exception:
+                    pass
+            
+            if stopping:
+                return
+    
+    def _stop_log_writer(self):
+        """停止日志写入线程，写完队列中剩余的日志"""
+        if self._log_writer.is_alive():
+            self._log_q.put(None)
+            self._log_writer.join(timeout=5)
+    
+    def _command_writer_loop(self):
+        """后台命令写入线程：取出排队的命令，发往同一进程的连续命令合并为一次写入"""
+        while True:
+            batch = [self._cmd_q.get()]
+            try:
+                while True:
+                    batch.append(self._cmd_q.get_nowait())
+            except queue.Empty:
+                pass
+            
+            # 按目标进程分组（排队期间服务器可能已重启），保持命令顺序
+            groups = []
+            for process, command in batch:
+                if groups and groups[-1][0] is process:
+                    groups[-1][1].append(command)
+                else:
+                    groups.append((process, [command]))
+            
+            for process, commands in groups:
+                if process.poll() is not None:
+                    self._log_command_output(f"服务器已停止，{len(commands)} 条命令未发送", "error")
+                    continue
+                try:
+                    process.stdin.write(''.join(f"{command}\n" for command in commands))
+                    process.stdin.flush()
+                except Exception as e:
+                    self._log_command_output(f"发送命令失败: {e}", "error")
+    
+    def _enqueue_command(self, process: subprocess.Popen, command: str):
+        """将命令加入写入队列，由后台线程写入指定服务器进程的 stdin"""
+        self._cmd_q.put((process, command))
     
-    def _save_to_unified_log(self, timestamp: str, message: str, level: str):
-        """保存到统一日志文件（带自动创建目录和实时刷新）"""
-        unified_log_file = self.logs_dir / "unified.log"
+    def _write_unified_log_lines(self, lines: List[str]):
+        """将多行日志一次性写入统一日志文件（带自动创建目录和实时刷新）"""
+        with self._unified_log_lock:
+            fp = self._get_unified_log_fp()
+            if fp is None:
+                return
+            try:
+                # 合并为一次写入，行缓冲模式下写入后自动刷新
+                fp.write(''.join(lines))
+                self._unified_log_seq += 1
+            except Exception as e:
+                print(f"{Colors.WARNING}写入日志失败: {e}{Colors.ENDC}")
+    
+    def _get_unified_log_fp(self):
+        """获取统一日志文件句柄，文件被删除或轮转后自动重新打开"""
+        if self._unified_log_fp is not None:
+            try:
+                if os.stat(self.unified_log_file).st_ino == self._unified_log_ino:
+                    return self._unified_log_fp
+            except OSError:
+                pass
+            self._close_unified_log()
         
         # 自动创建日志目录
         if not self.logs_dir.exists():
@@ -224,38 +537,116 @@ class MCServerManager:
                 self.logs_dir.mkdir(parents=True, exist_ok=True)
             except Exception as e:
                 print(f"{Colors.WARNING}创建日志目录失败: {e}{Colors.ENDC}")
-                return
+                return None
         
         try:
-            # 追加模式写入，并立即刷新
-            with open(unified_log_file, 'a', encoding='utf-8', buffering=1) as f:
-                f.write(f"[{timestamp}] [{level.upper()}] {message}\n")
-                f.flush()  # 立即刷新到磁盘
+            self._unified_log_fp = open(self.unified_log_file, 'a', encoding='utf-8', buffering=1)
+            self._unified_log_ino = os.fstat(self._unified_log_fp.fileno()).st_ino
         except Exception as e:
-            print(f"{Colors.WARNING}写入日志失败: {e}{Colors.ENDC}")
+            print(f"{Colors.WARNING}打开日志文件失败: {e}{Colors.ENDC}")
+            self._unified_log_fp = None
+        return self._unified_log_fp
+    
+    def _close_unified_log(self):
+        """关闭统一日志文件句柄"""
+        if self._unified_log_fp is not None:
+            try:
+                self._unified_log_fp.close()
+            except Exception:
+                pass
+            self._unified_log_fp = None
+            self._unified_log_ino = None
+    
+    def take_command_output(self) -> List[Dict]:
+        """取出并清空命令输出队列（加锁时只交换队列引用，不复制数据）"""
+        with self.command_output_lock:
+            output = self.command_output_queue
+            self.command_output_queue = collections.deque(maxlen=self.COMMAND_OUTPUT_MAX)
+        return list(output)
     
     def _load_persistent_output(self):
-        """从文件加载持久化的输出"""
-        output_file = self.server_dir / ".persistent_output.json"
+        """从文件加载持久化的输出（JSONL格式，只保留最近500条）"""
+        output_file = self.persistent_output_file
+        legacy_file = self.server_dir / ".persistent_output.json"
+        if not output_file.exists() and legacy_file.exists():
+            self._migrate_legacy_output(legacy_file)
+        
         if output_file.exists():
             try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    self.command_output_queue = json.load(f)
-                    # 限制加载的输出数量
-                    if len(self.command_output_queue) > 500:
-                        self.command_output_queue = self.command_output_queue[-500:]
+                line_count = 0
+                tail = collections.deque(maxlen=self.COMMAND_OUTPUT_MAX)
+                with open(output_file, 'rb') as f:
+                    for line in f:
+                        line_count += 1
+                        tail.append(line)
+                self._persisted_line_count = line_count
+                
+                # 进程在追加过程中被终止时，最后一行可能不完整：跳过损坏的行，不丢弃整个队列
+                entries = []
+                valid_lines = []
+                for line in tail:
+                    if not line.endswith(b'\n'):
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                        valid_lines.append(line)
+                    except ValueError:
+                        continue
+                self.command_output_queue = collections.deque(entries, maxlen=self.COMMAND_OUTPUT_MAX)
+                
+                # 有损坏的行时原子地重写文件，避免后续追加接在残缺行之后
+                if len(valid_lines) != len([line for line in tail if line.strip()]):
+                    print(f"{Colors.WARNING}持久化输出中有损坏的行，已跳过{Colors.ENDC}")
+                    self._rewrite_persistent_output(valid_lines)
             except Exception as e:
                 print(f"{Colors.WARNING}加载持久化输出失败: {e}{Colors.ENDC}")
-                self.command_output_queue = []
+                self.command_output_queue = collections.deque(maxlen=self.COMMAND_OUTPUT_MAX)
     
-    def _save_persistent_output(self):
-        """保存输出到持久化文件"""
-        output_file = self.server_dir / ".persistent_output.json"
+    def _migrate_legacy_output(self, legacy_file: Path):
+        """将旧版整文件JSON格式的持久化输出转换为JSONL格式"""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.command_output_queue, f, ensure_ascii=False, indent=2)
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)[-self.COMMAND_OUTPUT_MAX:]
+            self._rewrite_persistent_output([dumps_json_line(e) for e in entries])
+            legacy_file.unlink()
         except Exception as e:
-            print(f"{Colors.WARNING}保存持久化输出失败: {e}{Colors.ENDC}")
+            print(f"{Colors.WARNING}迁移旧版持久化输出失败: {e}{Colors.ENDC}")
+    
+    def _rewrite_persistent_output(self, lines: List[bytes]):
+        """用给定的行重写持久化文件（先写临时文件再原子替换）"""
+        output_file = self.persistent_output_file
+        tmp_file = output_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(b''.join(lines))
+        os.replace(tmp_file, output_file)
+        self._persisted_line_count = len(lines)
+    
+    def _save_persistent_output(self):
+        """将待写入的输出追加到持久化文件，行数过多时压缩"""
+        output_file = self.persistent_output_file
+        with self._output_save_lock:
+            with self.command_output_lock:
+                pending = self._pending_output
+                self._pending_output = []
+                self._last_output_flush = time.time()
+            if not pending:
+                return
+            try:
+                with open(output_file, 'ab') as f:
+                    f.write(b''.join(dumps_json_line(entry) for entry in pending))
+                self._persisted_line_count += len(pending)
+                
+                if self._persisted_line_count > self.OUTPUT_COMPACT_LINES:
+                    with open(output_file, 'rb') as f:
+                        tail = collections.deque(f, maxlen=self.COMMAND_OUTPUT_MAX)
+                    self._rewrite_persistent_output(list(tail))
+            except Exception as e:
+                print(f"{Colors.WARNING}保存持久化输出失败: {e}{Colors.ENDC}")
+    
+    def flush_persistent_output(self):
+        """将尚未写盘的输出立即保存到持久化文件"""
+        if self._pending_output:
+            self._save_persistent_output()
     
     def sync_system_time(self) -> Dict:
         """同步系统时间"""
@@ -282,25 +673,14 @@ class MCServerManager:
                 "time.apple.com"
             ]
             
-            for ntp_server in ntp_servers:
-                try:
-                    self._log_command_output(f"尝试从 {ntp_server} 同步时间...", "info")
-                    return_code, output_lines = self._run_command_with_output(
-                        ['ntpdate', '-u', ntp_server],
-                        cwd=None
-                    )
-                    
-                    if return_code == 0:
-                        self.last_time_sync = time.time()
-                        self._log_command_output(f"时间同步成功: {ntp_server}", "success")
-                        result["success"] = True
-                        result["message"] = f"时间同步成功: {ntp_server}"
-                        return result
-                except FileNotFoundError:
-                    continue
-                except Exception as e:
-                    self._log_command_output(f"使用 {ntp_server} 同步失败: {e}", "warning")
-                    continue
+            self._log_command_output(f"同时尝试从 {', '.join(ntp_servers)} 同步时间...", "info")
+            ntp_server = self._sync_time_from_ntp_servers(ntp_servers)
+            if ntp_server:
+                self.last_time_sync = time.time()
+                self._log_command_output(f"时间同步成功: {ntp_server}", "success")
+                result["success"] = True
+                result["message"] = f"时间同步成功: {ntp_server}"
+                return result
             
             # 方法2: 使用多个网络时间API
             time_apis = [
@@ -309,47 +689,24 @@ class MCServerManager:
                 'https://timeapi.io/api/Time/current/zone?timeZone=UTC'
             ]
             
-            for api_url in time_apis:
-                try:
-                    self._log_command_output(f"尝试使用网络时间API同步: {api_url}", "info")
-                    
-                    # 获取网络时间戳
-                    response = urllib.request.urlopen(api_url, timeout=10)
-                    data = json.loads(response.read().decode())
-                    
-                    # 根据不同的API响应格式提取时间戳
-                    if 'unixtime' in data:
-                        network_time = data['unixtime']
-                    elif 'unixTime' in data:
-                        network_time = data['unixTime']
-                    elif 'datetime' in data:
-                        # 解析ISO格式时间
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(data['datetime'].replace('Z', '+00:00'))
-                        network_time = int(dt.timestamp())
-                    else:
-                        self._log_command_output(f"无法解析时间API响应: {api_url}", "warning")
-                        continue
-                    
-                    # 设置系统时间
-                    import os
-                    os.system(f'date -u @{network_time}')
-                    
-                    self.last_time_sync = time.time()
-                    self._log_command_output(f"时间同步成功: {api_url}", "success")
-                    result["success"] = True
-                    result["message"] = f"时间同步成功: {api_url}"
-                    return result
-                    
-                except Exception as e:
-                    self._log_command_output(f"网络时间API同步失败 ({api_url}): {e}", "warning")
-                    continue
+            self._log_command_output("同时尝试使用网络时间API同步...", "info")
+            api_url, network_time, errors = self._run_parallel_first(self._fetch_network_time, time_apis)
+            for failed_url, error in errors.items():
+                self._log_command_output(f"网络时间API同步失败 ({failed_url}): {error}", "warning")
+            if api_url:
+                # 设置系统时间
+                os.system(f'date -u @{network_time}')
+                
+                self.last_time_sync = time.time()
+                self._log_command_output(f"时间同步成功: {api_url}", "success")
+                result["success"] = True
+                result["message"] = f"时间同步成功: {api_url}"
+                return result
             
             # 方法3: 使用 timedatectl（如果可用）
             try:
-                return_code, output_lines = self._run_command_with_output(
-                    ['timedatectl', 'set-ntp', 'true'],
-                    cwd=None
+                return_code, output_lines = self._run_command_quick(
+                    ['timedatectl', 'set-ntp', 'true']
                 )
                 
                 if return_code == 0:
@@ -366,9 +723,8 @@ class MCServerManager:
             # 方法4: 使用 ntpdig（如果可用）
             try:
                 self._log_command_output("尝试使用 ntpdig 同步时间...", "info")
-                return_code, output_lines = self._run_command_with_output(
-                    ['ntpdig', '-N', 'time.google.com'],
-                    cwd=None
+                return_code, output_lines = self._run_command_quick(
+                    ['ntpdig', '-N', 'time.google.com']
                 )
                 
                 if return_code == 0 and output_lines:
@@ -378,7 +734,6 @@ class MCServerManager:
                             try:
                                 # ntpdig输出格式通常是: 1234567890.123
                                 timestamp = float(line.strip().split()[0])
-                                import os
                                 os.system(f'date -u @{int(timestamp)}')
                                 
                                 self.last_time_sync = time.time()
@@ -396,9 +751,8 @@ class MCServerManager:
             # 方法5: 使用 sntp（如果可用）
             try:
                 self._log_command_output("尝试使用 sntp 同步时间...", "info")
-                return_code, output_lines = self._run_command_with_output(
-                    ['sntp', '-Ss', 'time.google.com'],
-                    cwd=None
+                return_code, output_lines = self._run_command_quick(
+                    ['sntp', '-Ss', 'time.google.com']
                 )
                 
                 if return_code == 0:
@@ -420,6 +774,64 @@ class MCServerManager:
             result["message"] = f"时间同步出错: {e}"
             return result
     
+    @staticmethod
+    def _run_parallel_first(func, items: List[str]) -> Tuple[Optional[str], object, Dict[str, Exception]]:
+        """并行对每一项调用func，返回最先成功的 (项, 返回值, 此前各项的失败原因)
+        
+        func 返回假值或抛出异常均视为失败；全部失败时项和返回值为 None。
+        """
+        errors = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(items))
+        try:
+            futures = {executor.submit(func, item): item for item in items}
+            for future in concurrent.futures.as_completed(futures):
+                item = futures[future]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    errors[item] = e
+                    continue
+                if value:
+                    return item, value, errors
+            return None, None, errors
+        finally:
+            # 不等待其余仍在进行的尝试
+            executor.shutdown(wait=False)
+    
+    def _sync_time_from_ntp_servers(self, ntp_servers: List[str]) -> Optional[str]:
+        """同时使用 ntpdate 向多个NTP服务器同步，返回最先成功的服务器，其余进程会被终止"""
+        finished = threading.Event()
+        
+        def probe(ntp_server: str) -> bool:
+            return_code, _ = self._run_command_quick(['ntpdate', '-u', ntp_server], cancel=finished)
+            return return_code == 0
+        
+        ntp_server, _, errors = self._run_parallel_first(probe, ntp_servers)
+        # 终止其余仍在运行的 ntpdate，避免成功后再次修改时钟
+        finished.set()
+        for failed_server, error in errors.items():
+            # ntpdate 不存在时静默跳过
+            if not isinstance(error, FileNotFoundError):
+                self._log_command_output(f"使用 {failed_server} 同步失败: {error}", "warning")
+        return ntp_server
+    
+    @staticmethod
+    def _fetch_network_time(api_url: str) -> int:
+        """从网络时间API获取当前UNIX时间戳"""
+        with urllib.request.urlopen(api_url, timeout=10) as response:
+            data = json.load(response)
+        
+        # 根据不同的API响应格式提取时间戳
+        if 'unixtime' in data:
+            return data['unixtime']
+        elif 'unixTime' in data:
+            return data['unixTime']
+        elif 'datetime' in data:
+            # 解析ISO格式时间
+            dt = datetime.fromisoformat(data['datetime'].replace('Z', '+00:00'))
+            return int(dt.timestamp())
+        raise ValueError("无法解析时间API响应")
+    
     def get_time_sync_status(self) -> Dict:
         """获取时间同步状态"""
         status = {
@@ -431,7 +843,6 @@ class MCServerManager:
         }
         
         if self.last_time_sync > 0:
-            from datetime import datetime
             last_sync_datetime = datetime.fromtimestamp(self.last_time_sync)
             status["last_sync_formatted"] = last_sync_datetime.strftime("%Y-%m-%d %H:%M:%S")
         else:
@@ -475,21 +886,31 @@ class MCServerManager:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
                 cwd=cwd or str(self.server_dir)
             )
             
-            # 实时读取输出
-            while True:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    line = line.strip()
-                    if line:  # 只记录非空行
-                        output_lines.append(line)
-                        self._log_command_output(line, "output")
+            # 实时读取输出：按块读取管道，整块中的所有行一次性记录
+            fd = process.stdout.fileno()
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            partial = ''
+            with selectors.DefaultSelector() as selector:
+                selector.register(fd, selectors.EVENT_READ)
+                while True:
+                    selector.select()
+                    chunk = os.read(fd, 65536)
+                    final = not chunk
+                    text = partial + decoder.decode(chunk, final=final)
+                    parts = text.replace('\r', '\n').split('\n')
+                    partial = '' if final else parts.pop()
+                    
+                    lines = [line.strip() for line in parts]
+                    lines = [line for line in lines if line]  # 只记录非空行
+                    if lines:
+                        output_lines.extend(lines)
+                        self._log_command_output_many(lines, "output")
+                    if final:
+                        break
+            process.stdout.close()
             
             return_code = process.wait()
             self._log_command_output(f"命令完成，返回码: {return_code}", "success" if return_code == 0 else "error")
@@ -500,6 +921,52 @@ class MCServerManager:
             self._log_command_output(error_msg, "error")
             return -1, [error_msg]
     
+    def _run_command_quick(self, cmd: List[str], timeout: float = None,
+                           cancel: threading.Event = None) -> Tuple[int, List[str]]:
+        """运行输出很少的短命令，结束后一次性记录输出（命令不存在时抛出 FileNotFoundError）
+        
+        cancel 被设置时终止命令并返回 (-1, [])，不再记录任何输出。
+        """
+        if timeout is None:
+            timeout = self.QUICK_COMMAND_TIMEOUT
+        self._log_command_output(f"执行命令: {' '.join(cmd)}", "command")
+        
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        )
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                # 有取消事件时分段等待，以便及时响应取消
+                stdout, _ = process.communicate(
+                    timeout=max(0, min(remaining, 0.1)) if cancel is not None else max(0, remaining))
+                break
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.is_set():
+                    process.terminate()
+                    process.communicate()
+                    return -1, []
+                if time.monotonic() >= deadline:
+                    process.kill()
+                    process.communicate()
+                    error_msg = f"命令超时（{timeout}秒）: {' '.join(cmd)}"
+                    self._log_command_output(error_msg, "error")
+                    return -1, [error_msg]
+        
+        if cancel is not None and cancel.is_set():
+            return -1, []
+        
+        output_lines = [line.strip() for line in stdout.splitlines() if line.strip()]
+        if output_lines:
+            self._log_command_output_many(output_lines, "output")
+        self._log_command_output(f"命令完成，返回码: {process.returncode}",
+                                 "success" if process.returncode == 0 else "error")
+        return process.returncode, output_lines
+    
     def check_java(self) -> Tuple[bool, str]:
         """检查Java是否安装"""
         try:
@@ -548,12 +1015,24 @@ class MCServerManager:
         print(f"\n{Colors.OKCYAN}正在下载Fabric安装器 {version}...{Colors.ENDC}")
         
         try:
-            def progress_hook(count, block_size, total_size):
-                percent = int(count * block_size * 100 / total_size)
-                sys.stdout.write(f"\r下载进度: {percent}%")
-                sys.stdout.flush()
-            
-            urllib.request.urlretrieve(url, installer_path, reporthook=progress_hook)
+            with urllib.request.urlopen(url, timeout=30) as response, open(installer_path, 'wb') as f:
+                total_size = int(response.headers.get('Content-Length') or 0)
+                downloaded = 0
+                next_report = 0
+                while True:
+                    chunk = response.read(1 << 20)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    # 每下载256KB才刷新一次进度，减少终端输出
+                    if downloaded >= next_report:
+                        next_report = downloaded + (256 << 10)
+                        if total_size > 0:
+                            sys.stdout.write(f"\r下载进度: {downloaded * 100 // total_size}%")
+                        else:
+                            sys.stdout.write(f"\r已下载: {downloaded // 1024} KB")
+                        sys.stdout.flush()
             print(f"\n{Colors.OKGREEN}✓ Fabric安装器下载完成！{Colors.ENDC}")
             return installer_path
         except Exception as e:
@@ -561,21 +1040,40 @@ class MCServerManager:
             raise
     
     def get_available_mc_versions(self) -> List[str]:
-        """获取可用的Minecraft版本列表"""
+        """获取可用的Minecraft版本列表（内存和磁盘缓存24小时）"""
+        cache = self._mc_versions_cache
+        if cache is None:
+            cached = self._load_json(self.mc_versions_cache_file, None)
+            if isinstance(cached, dict) and 'fetched_at' in cached and 'versions' in cached:
+                cache = self._mc_versions_cache = (cached['fetched_at'], cached['versions'])
+        
+        # 缓存时间晚于当前时间（记录时系统时钟偏快）视为过期，不能一直当作新鲜缓存
+        if cache and 0 <= time.time() - cache[0] < self.MC_VERSIONS_CACHE_TTL:
+            return list(cache[1])
+        
         try:
             url = "https://meta.fabricmc.net/v2/game/version"
-            response = urllib.request.urlopen(url, timeout=10)
-            versions_data = json.loads(response.read().decode())
+            with urllib.request.urlopen(url, timeout=10) as response:
+                versions_data = json.load(response)
             
-            versions = []
-            for v in versions_data:
-                if v.get('stable', True):
-                    versions.append(v['version'])
+            # 每个版本只解析一次排序键
+            decorated = [(tuple(int(i) for i in v['version'].split('.')), v['version'])
+                         for v in versions_data if v.get('stable', True)]
+            decorated.sort(reverse=True)
+            versions = [version for _, version in decorated[:20]]
             
-            versions.sort(key=lambda x: [int(i) for i in x.split('.')], reverse=True)
-            return versions[:20]
+            fetched_at = time.time()
+            self._mc_versions_cache = (fetched_at, versions)
+            try:
+                self._save_json(self.mc_versions_cache_file, {"fetched_at": fetched_at, "versions": versions})
+            except Exception as e:
+                print(f"{Colors.WARNING}保存版本列表缓存失败: {e}{Colors.ENDC}")
+            return list(versions)
         except Exception as e:
             print(f"{Colors.WARNING}无法获取版本列表: {e}{Colors.ENDC}")
+            # 获取失败时优先使用过期的缓存
+            if cache:
+                return list(cache[1])
             return ["1.21.5", "1.21.4", "1.21.3", "1.21.1", "1.20.4", "1.20.1", "1.19.4", "1.19.3", "1.19.2", "1.18.2"]
     
     def install_fabric_server(self, mc_version: str = "1.21.5") -> Dict:
@@ -633,7 +1131,9 @@ class MCServerManager:
                     f.write("eula=true\n")
                 self._log_command_output("已接受EULA协议", "success")
                 
-                self.properties = self._load_properties()
+                # server.properties 通常在服务器首次启动时才生成，文件为空时无需重新加载
+                if self.config_file.exists() and self.config_file.stat().st_size > 0:
+                    self.properties = self._load_properties()
                 result["success"] = True
                 result["message"] = "Fabric服务器安装成功"
                 return result
@@ -668,11 +1168,11 @@ class MCServerManager:
             
             self._log_command_output(f"正在启动服务器: {launch_jar.name}", "info")
             
+            # 先写入尚在延迟写盘的配置，确保服务器读取到最新的配置文件
+            self.flush_config_files()
+            
             try:
-                # 计算内存分配（可用内存的70%）
-                import psutil
-                total_memory = psutil.virtual_memory().total
-                heap_size = int(total_memory * 0.7 / 1024 / 1024)
+                heap_size = self._heap_size_mb
                 
                 cmd = [
                     'java',
@@ -704,15 +1204,13 @@ class MCServerManager:
                         for line in self.server_process.stdout:
                             line = line.rstrip('\n\r')
                             if line:
-                                timestamp = datetime.now().strftime("%H:%M:%S")
+                                timestamp = self._now_hms()
                                 formatted_line = self._format_log_message(line)
-                                self._save_to_unified_log(timestamp, formatted_line, "output")
-                                # 同时输出到控制台
-                                print(f"[SERVER] {formatted_line}")
+                                # 写入统一日志并输出到控制台（由后台写入线程完成）
+                                self._log_q.put((timestamp, formatted_line, "output", True))
                     except:
                         pass
                 
-                import threading
                 output_thread = threading.Thread(target=read_server_output, daemon=True)
                 output_thread.start()
                 
@@ -738,8 +1236,8 @@ class MCServerManager:
             print(f"\n{Colors.WARNING}正在停止服务器...{Colors.ENDC}")
             
             try:
-                self.server_process.stdin.write("stop\n")
-                self.server_process.stdin.flush()
+                # 经命令队列发送，排在之前已提交的命令之后
+                self._enqueue_command(self.server_process, "stop")
                 
                 try:
                     self.server_process.wait(timeout=30)
@@ -764,7 +1262,7 @@ class MCServerManager:
         """重启服务器"""
         print(f"\n{Colors.WARNING}正在重启服务器...{Colors.ENDC}")
         
-        if self.server_process and self.server_process.poll() is None:
+        if self._is_running():
             stop_result = self.stop_server()
             if not stop_result["success"]:
                 return stop_result
@@ -772,8 +1270,13 @@ class MCServerManager:
         
         return self.start_server()
     
+    def _is_running(self) -> bool:
+        """无锁检查服务器是否在运行（只读取一次进程引用，供状态查询等只读路径使用）"""
+        server_process = self.server_process
+        return server_process is not None and server_process.poll() is None
+    
     def get_server_status(self) -> Dict:
-        """获取服务器状态"""
+        """获取服务器状态（不获取 server_lock）"""
         status = {
             "running": False,
             "pid": None,
@@ -782,13 +1285,15 @@ class MCServerManager:
             "cpu_usage": 0
         }
         
-        if self.server_process and self.server_process.poll() is None:
+        # 只读取一次进程引用，避免与启动/停止并发时引用被置为 None
+        server_process = self.server_process
+        if server_process is not None and server_process.poll() is None:
             status["running"] = True
-            status["pid"] = self.server_process.pid
+            status["pid"] = server_process.pid
             
             if PSUTIL_AVAILABLE:
                 try:
-                    process = psutil.Process(self.server_process.pid)
+                    process = psutil.Process(server_process.pid)
                     status["memory_usage"] = process.memory_info().rss / 1024 / 1024  # MB
                     status["cpu_usage"] = process.cpu_percent()
                 except psutil.NoSuchProcess:
@@ -801,41 +1306,109 @@ class MCServerManager:
         if lines is None:
             lines = SERVER_LOG_LINES
         
-        unified_log_file = self.logs_dir / "unified.log"
+        unified_log_file = self.unified_log_file
         if not unified_log_file.exists():
             # 如果统一日志不存在，尝试从命令输出队列获取
             if self.command_output_queue:
                 return [f"{item['level'].upper()} [{item['timestamp']}] {item['message']}" 
-                       for item in self.command_output_queue[-lines:]]
+                       for item in list(self.command_output_queue)[-lines:]]
             return ["暂无日志"]
         
         try:
-            with open(unified_log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                all_lines = f.readlines()
-                # 不进行格式化，直接返回原始日志行
-                if len(all_lines) > lines:
-                    return [line.rstrip('\n\r') for line in all_lines[-lines:]]
-                else:
-                    return [line.rstrip('\n\r') for line in all_lines]
+            with open(unified_log_file, 'rb') as f:
+                try:
+                    return self._mmap_tail_lines(f, lines)
+                except (OSError, ValueError):
+                    # 无法使用mmap时从文件末尾按块向前读取
+                    return self._read_tail_lines(f, lines)
         except Exception as e:
             return [f"读取日志失败: {e}"]
     
+    @staticmethod
+    def _mmap_tail_lines(f, lines: int) -> List[str]:
+        """通过mmap从文件末尾向前查找换行符，只解码最后N行"""
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = size
+            if mm[end - 1] == 0x0A:  # 忽略末尾换行
+                end -= 1
+            
+            start = 0
+            if lines > 0:
+                pos = end
+                for _ in range(lines):
+                    pos = mm.rfind(b'\n', 0, pos)
+                    if pos < 0:
+                        break
+                start = pos + 1
+            data = mm[start:end]
+        
+        # 不进行格式化，直接返回原始日志行
+        return [line.rstrip('\r') for line in data.decode('utf-8', errors='ignore').split('\n')]
+    
+    @staticmethod
+    def _read_tail_lines(f, lines: int, block_size: int = 65536) -> List[str]:
+        """从文件末尾按块向前读取，直到包含足够的换行符，只解码最后N行"""
+        pos = f.seek(0, os.SEEK_END)
+        if pos == 0:
+            return []
+        
+        chunks = []
+        newlines = 0
+        # 末尾换行不算作一行，因此需要找到 N+1 个换行符
+        while pos > 0 and (lines <= 0 or newlines <= lines):
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+        data = b''.join(reversed(chunks))
+        
+        if data.endswith(b'\n'):  # 忽略末尾换行
+            data = data[:-1]
+        tail = data.decode('utf-8', errors='ignore').split('\n')
+        if lines > 0:
+            tail = tail[-lines:]
+        return [line.rstrip('\r') for line in tail]
+    
     def get_new_logs(self) -> List[str]:
         """获取新增的日志行（从统一日志文件）"""
-        unified_log_file = self.logs_dir / "unified.log"
+        # 上次读取后没有新的写入时直接返回，不打开文件
+        seq = self._unified_log_seq
+        if seq == self._new_logs_seen_seq:
+            return []
+        self._new_logs_seen_seq = seq
+        
+        unified_log_file = self.unified_log_file
         if not unified_log_file.exists():
             return []
         
         try:
-            with open(unified_log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                f.seek(self.log_position)
-                new_lines = f.readlines()
-                self.log_position = f.tell()
-                # 格式化每行日志
-                formatted_lines = []
-                for line in new_lines:
-                    formatted_lines.append(self._format_log_message(line.rstrip('\n\r')))
-                return formatted_lines
+            with open(unified_log_file, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size < self.log_position:
+                    # 日志文件被轮转或截断，从头开始读取
+                    self.log_position = 0
+                
+                if size - self.log_position > self.NEW_LOGS_MAX_BYTES:
+                    # 积压过多（如首次读取大文件）时只返回末尾部分
+                    new_lines = self._read_tail_lines(f, SERVER_LOG_LINES)
+                    self.log_position = size
+                else:
+                    f.seek(self.log_position)
+                    data = f.read()
+                    self.log_position = f.tell()
+                    if data.endswith(b'\n'):
+                        data = data[:-1]
+                    new_lines = data.decode('utf-8', errors='ignore').split('\n') if data else []
+                
+                # 格式化每行日志（一次性构建结果列表）
+                format_line = self._format_log_message
+                return [format_line(line.rstrip('\r')) for line in new_lines]
         except Exception:
             return []
     
@@ -844,19 +1417,20 @@ class MCServerManager:
         result = {"success": False, "message": ""}
         
         # 检查是否已存在
-        for player in self.whitelist:
-            if player['name'].lower() == player_name.lower():
-                result["message"] = f"玩家 {player_name} 已在白名单中"
-                return result
+        key = self._name_key(player_name)
+        if key in self._whitelist_idx:
+            result["message"] = f"玩家 {player_name} 已在白名单中"
+            return result
         
         entry = {
             "uuid": "00000000-0000-0000-0000-000000000000",
             "name": player_name
         }
+        self._whitelist_idx[key] = entry
         self.whitelist.append(entry)
-        self._save_json(self.whitelist_file, self.whitelist)
+        self._mark_config_dirty('whitelist')
         self.properties['white-list'] = 'true'
-        self._save_properties()
+        self._mark_config_dirty('properties')
         
         result["success"] = True
         result["message"] = f"{player_name} 已添加到白名单"
@@ -866,14 +1440,13 @@ class MCServerManager:
         """从白名单移除玩家"""
         result = {"success": False, "message": ""}
         
-        original_count = len(self.whitelist)
-        self.whitelist = [p for p in self.whitelist if p['name'].lower() != player_name.lower()]
-        
-        if len(self.whitelist) == original_count:
+        entry = self._whitelist_idx.pop(self._name_key(player_name), None)
+        if entry is None:
             result["message"] = f"玩家 {player_name} 不在白名单中"
             return result
+        self._remove_entry(self.whitelist, entry)
         
-        self._save_json(self.whitelist_file, self.whitelist)
+        self._mark_config_dirty('whitelist')
         result["success"] = True
         result["message"] = f"{player_name} 已从白名单移除"
         return result
@@ -883,18 +1456,19 @@ class MCServerManager:
         result = {"success": False, "message": ""}
         
         # 检查是否已存在
-        for op in self.ops:
-            if op['name'].lower() == player_name.lower():
-                result["message"] = f"玩家 {player_name} 已是管理员"
-                return result
+        key = self._name_key(player_name)
+        if key in self._ops_idx:
+            result["message"] = f"玩家 {player_name} 已是管理员"
+            return result
         
         entry = {
             "uuid": "00000000-0000-0000-0000-000000000000",
             "name": player_name,
             "level": level
         }
+        self._ops_idx[key] = entry
         self.ops.append(entry)
-        self._save_json(self.ops_file, self.ops)
+        self._mark_config_dirty('ops')
         
         result["success"] = True
         result["message"] = f"{player_name} 已设置为管理员 (Level {level})"
@@ -904,14 +1478,13 @@ class MCServerManager:
         """移除管理员"""
         result = {"success": False, "message": ""}
         
-        original_count = len(self.ops)
-        self.ops = [p for p in self.ops if p['name'].lower() != player_name.lower()]
-        
-        if len(self.ops) == original_count:
+        entry = self._ops_idx.pop(self._name_key(player_name), None)
+        if entry is None:
             result["message"] = f"玩家 {player_name} 不是管理员"
             return result
+        self._remove_entry(self.ops, entry)
         
-        self._save_json(self.ops_file, self.ops)
+        self._mark_config_dirty('ops')
         result["success"] = True
         result["message"] = f"{player_name} 已移除管理员权限"
         return result
@@ -921,10 +1494,10 @@ class MCServerManager:
         result = {"success": False, "message": ""}
         
         # 检查是否已封禁
-        for player in self.banned_players:
-            if player['name'].lower() == player_name.lower():
-                result["message"] = f"玩家 {player_name} 已被封禁"
-                return result
+        key = self._name_key(player_name)
+        if key in self._banned_players_idx:
+            result["message"] = f"玩家 {player_name} 已被封禁"
+            return result
         
         entry = {
             "uuid": "00000000-0000-0000-0000-000000000000",
@@ -934,8 +1507,9 @@ class MCServerManager:
             "expires": "forever",
             "reason": reason or "Banned by an operator"
         }
+        self._banned_players_idx[key] = entry
         self.banned_players.append(entry)
-        self._save_json(self.banned_players_file, self.banned_players)
+        self._mark_config_dirty('banned_players')
         
         result["success"] = True
         result["message"] = f"{player_name} 已被封禁"
@@ -945,14 +1519,13 @@ class MCServerManager:
         """解封玩家"""
         result = {"success": False, "message": ""}
         
-        original_count = len(self.banned_players)
-        self.banned_players = [p for p in self.banned_players if p['name'].lower() != player_name.lower()]
-        
-        if len(self.banned_players) == original_count:
+        entry = self._banned_players_idx.pop(self._name_key(player_name), None)
+        if entry is None:
             result["message"] = f"玩家 {player_name} 未被封禁"
             return result
+        self._remove_entry(self.banned_players, entry)
         
-        self._save_json(self.banned_players_file, self.banned_players)
+        self._mark_config_dirty('banned_players')
         result["success"] = True
         result["message"] = f"{player_name} 已解封"
         return result
@@ -962,10 +1535,9 @@ class MCServerManager:
         result = {"success": False, "message": ""}
         
         # 检查是否已封禁
-        for ip in self.banned_ips:
-            if ip['ip'] == ip_address:
-                result["message"] = f"IP {ip_address} 已被封禁"
-                return result
+        if self.is_ip_banned(ip_address):
+            result["message"] = f"IP {ip_address} 已被封禁"
+            return result
         
         entry = {
             "ip": ip_address,
@@ -974,38 +1546,50 @@ class MCServerManager:
             "expires": "forever",
             "reason": reason or "Banned by an operator"
         }
+        self._banned_ips_idx[ip_address] = entry
         self.banned_ips.append(entry)
-        self._save_json(self.banned_ips_file, self.banned_ips)
+        self._mark_config_dirty('banned_ips')
         
         result["success"] = True
         result["message"] = f"IP {ip_address} 已被封禁"
         return result
     
+    def is_ip_banned(self, ip_address: str) -> bool:
+        """检查IP是否已被封禁（通过索引O(1)查找）"""
+        return ip_address in self._banned_ips_idx
+    
     def unban_ip(self, ip_address: str) -> Dict:
         """解封IP"""
         result = {"success": False, "message": ""}
         
-        original_count = len(self.banned_ips)
-        self.banned_ips = [ip for ip in self.banned_ips if ip['ip'] != ip_address]
-        
-        if len(self.banned_ips) == original_count:
+        entry = self._banned_ips_idx.pop(ip_address, None)
+        if entry is None:
             result["message"] = f"IP {ip_address} 未被封禁"
             return result
+        self._remove_entry(self.banned_ips, entry)
         
-        self._save_json(self.banned_ips_file, self.banned_ips)
+        self._mark_config_dirty('banned_ips')
         result["success"] = True
         result["message"] = f"IP {ip_address} 已解封"
         return result
     
     def get_mods_list(self) -> List[str]:
-        """获取已安装的mod列表"""
-        if not self.mods_dir.exists():
+        """获取已安装的mod列表（目录未变化时直接返回缓存）"""
+        try:
+            mtime_ns = self.mods_dir.stat().st_mtime_ns
+        except FileNotFoundError:
             return []
         
-        mods = []
-        for mod_file in self.mods_dir.glob("*.jar"):
-            mods.append(mod_file.name)
-        return mods
+        cache = self._mods_cache
+        if cache is not None and cache[0] == mtime_ns:
+            return list(cache[1])
+        
+        with os.scandir(self.mods_dir) as entries:
+            mods = [entry.name for entry in entries
+                    if entry.name.endswith('.jar') and entry.is_file()]
+        self._mods_cache = (mtime_ns, mods)
+        self._bump_data_version('mods')
+        return list(mods)
     
     def add_mod(self, mod_path: str) -> Dict:
         """添加mod"""
@@ -1027,6 +1611,7 @@ class MCServerManager:
                 return result
             
             shutil.copy(mod_path, self.mods_dir)
+            self._mods_cache = None
             result["success"] = True
             result["message"] = f"Mod {mod_file.name} 添加成功"
             return result
@@ -1045,6 +1630,7 @@ class MCServerManager:
         
         try:
             mod_file.unlink()
+            self._mods_cache = None
             result["success"] = True
             result["message"] = f"Mod {mod_name} 已删除"
             return result
@@ -1052,21 +1638,6 @@ class MCServerManager:
             result["message"] = f"删除mod失败: {e}"
             return result
     
-    def update_property(self, key: str, value: str) -> Dict:
-        """更新服务器配置"""
-        result = {"success": False, "message": ""}
-        
-        if key not in self.properties:
-            result["message"] = f"配置项 {key} 不存在"
-            return result
-        
-        self.properties[key] = value
-        self._save_properties()
-        
-        result["success"] = True
-        result["message"] = f"配置 {key} 已更新为 {value}"
-        return result
-    
     def backup_world(self) -> Dict:
         """备份世界"""
         result = {"success": False, "message": ""}
@@ -1081,38 +1652,69 @@ class MCServerManager:
         backup_path = self.backups_dir / backup_name
         
         try:
-            import zipfile
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED,
+                                 allowZip64=True, compresslevel=1) as zipf, \
+                    concurrent.futures.ThreadPoolExecutor(max_workers=self.BACKUP_READ_WORKERS) as pool:
+                # 线程池预读文件内容，当前线程按提交顺序压缩写入；限制预读数量避免整个世界读入内存
+                pending = collections.deque()
+                
+                def write_oldest():
+                    zinfo, compress_type, future = pending.popleft()
+                    zipf.writestr(zinfo, future.result(), compress_type=compress_type, compresslevel=1)
+                
                 for root, dirs, files in os.walk(world_dir):
                     for file in files:
                         file_path = os.path.join(root, file)
                         arcname = os.path.relpath(file_path, self.server_dir)
-                        zipf.write(file_path, arcname)
+                        # 区块文件等本身已压缩，直接存储，避免无效的重复压缩
+                        if os.path.splitext(file)[1].lower() in self.BACKUP_STORED_EXTENSIONS:
+                            compress_type = zipfile.ZIP_STORED
+                        else:
+                            compress_type = zipfile.ZIP_DEFLATED
+                        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                        pending.append((zinfo, compress_type, pool.submit(Path(file_path).read_bytes)))
+                        if len(pending) >= self.BACKUP_READ_AHEAD:
+                            write_oldest()
+                while pending:
+                    write_oldest()
+            self._backups_cache = None
             
             result["success"] = True
             result["message"] = f"世界已备份到 {backup_name}"
             result["backup_path"] = str(backup_path)
             return result
         except Exception as e:
+            self._backups_cache = None
             result["message"] = f"备份失败: {e}"
             return result
     
     def get_backups_list(self) -> List[Dict]:
-        """获取备份列表"""
+        """获取备份列表（目录未变化时直接返回缓存）"""
         backups = []
-        if not self.backups_dir.exists():
+        try:
+            mtime_ns = self.backups_dir.stat().st_mtime_ns
+        except FileNotFoundError:
             return backups
         
-        for backup_file in self.backups_dir.glob("*.zip"):
-            stat = backup_file.stat()
-            backups.append({
-                "name": backup_file.name,
-                "size": stat.st_size,
-                "created": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-            })
+        cache = self._backups_cache
+        if cache is not None and cache[0] == mtime_ns:
+            return list(cache[1])
         
-        backups.sort(key=lambda x: x["created"], reverse=True)
-        return backups
+        with os.scandir(self.backups_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.zip') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                backups.append({
+                    "name": entry.name,
+                    "size": stat.st_size,
+                    "created": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                })
+        
+        backups.sort(key=operator.itemgetter("created"), reverse=True)
+        self._backups_cache = (mtime_ns, backups)
+        self._bump_data_version('backups')
+        return list(backups)
     
     def delete_backup(self, backup_name: str) -> Dict:
         """删除备份"""
@@ -1125,6 +1727,7 @@ class MCServerManager:
         
         try:
             backup_path.unlink()
+            self._backups_cache = None
             result["success"] = True
             result["message"] = f"备份 {backup_name} 已删除"
             return result
@@ -1136,21 +1739,45 @@ class MCServerManager:
         """强制结束所有 Java 进程"""
         result = {"success": False, "message": "", "killed_count": 0}
         
+        if not PSUTIL_AVAILABLE:
+            java_pids = self._java_pids()
+            if java_pids is not None:
+                # 没有 psutil 但有 /proc，直接发送 SIGKILL（与 pkill -9 行为一致）
+                killed_count = 0
+                for pid in java_pids:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                        killed_count += 1
+                    except OSError:
+                        pass
+                if killed_count == 0:
+                    result["message"] = "没有找到 Java 进程或结束失败"
+                    return result
+                result["success"] = True
+                result["message"] = f"已结束 {killed_count} 个 Java 进程"
+                result["killed_count"] = killed_count
+                
+                # 清除服务器进程引用
+                if self.server_process:
+                    self.server_process = None
+                
+                return result
+        
         try:
             import psutil
-            killed_count = 0
+            terminated = []
             
-            for proc in psutil.process_iter(['pid', 'name']):
+            for proc in self._find_java_processes():
                 try:
-                    if proc.info['name'] and 'java' in proc.info['name'].lower():
-                        self._log_command_output(f"结束 Java 进程: PID {proc.info['pid']} - {proc.info['name']}", "info")
-                        proc.terminate()
-                        killed_count += 1
+                    self._log_command_output(f"结束 Java 进程: PID {proc.pid} - {proc.name()}", "info")
+                    proc.terminate()
+                    terminated.append(proc)
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
+            killed_count = len(terminated)
             
-            # 等待进程结束
-            time.sleep(2)
+            # 等待进程结束（全部结束后立即返回，最多等待2秒）
+            psutil.wait_procs(terminated, timeout=2)
             
             result["success"] = True
             result["message"] = f"已结束 {killed_count} 个 Java 进程"
@@ -1182,30 +1809,73 @@ class MCServerManager:
             result["message"] = f"结束进程失败: {e}"
             return result
     
+    @staticmethod
+    def _java_pids() -> Optional[List[int]]:
+        """直接读取 /proc/<pid>/comm 查找 Java 进程PID，系统没有 /proc 时返回 None"""
+        pids = []
+        try:
+            with os.scandir('/proc') as it:
+                for entry in it:
+                    if not entry.name.isdigit():
+                        continue
+                    try:
+                        with open(f'/proc/{entry.name}/comm', 'rb') as f:
+                            if b'java' in f.read().lower():
+                                pids.append(int(entry.name))
+                    except OSError:
+                        pass
+        except OSError:
+            return None
+        return pids
+    
+    @classmethod
+    def _find_java_processes(cls) -> List["psutil.Process"]:
+        """查找所有 Java 进程：优先读取 /proc，其次用 pgrep 按进程名查找，都不可用时遍历所有进程"""
+        pids = cls._java_pids()
+        if pids is None:
+            try:
+                completed = subprocess.run(['pgrep', '-i', 'java'], capture_output=True, text=True, timeout=5)
+                pids = [int(pid) for pid in completed.stdout.split() if pid.isdigit()]
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pass
+        
+        if pids is not None:
+            processes = []
+            for pid in pids:
+                try:
+                    processes.append(psutil.Process(pid))
+                except psutil.NoSuchProcess:
+                    pass
+            return processes
+        
+        processes = []
+        for proc in psutil.process_iter(['name']):
+            try:
+                if proc.info['name'] and 'java' in proc.info['name'].lower():
+                    processes.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return processes
+    
     def send_command(self, command: str) -> Dict:
         """向服务器发送命令"""
         result = {"success": False, "message": "", "output": ""}
         
-        if not self.server_process or self.server_process.poll() is not None:
+        # 只读取一次进程引用，检查与入队使用同一个进程对象
+        server_process = self.server_process
+        if server_process is None or server_process.poll() is not None:
             result["message"] = "服务器未运行，无法发送命令"
             return result
         
-        try:
-            self._log_command_output(f"发送命令: {command}", "command")
-            
-            # 发送命令到服务器 stdin
-            self.server_process.stdin.write(f"{command}\n")
-            self.server_process.stdin.flush()
-            
-            result["success"] = True
-            result["message"] = f"命令 '{command}' 已发送"
-            result["command"] = command
-            return result
-            
-        except Exception as e:
-            self._log_command_output(f"发送命令失败: {e}", "error")
-            result["message"] = f"发送命令失败: {e}"
-            return result
+        self._log_command_output(f"发送命令: {command}", "command")
+        
+        # 加入命令队列，由后台线程写入服务器 stdin（写入失败时记录到命令输出）
+        self._enqueue_command(server_process, command)
+        
+        result["success"] = True
+        result["message"] = f"命令 '{command}' 已发送"
+        result["command"] = command
+        return result
 
 
 # Flask 应用和路由
@@ -1217,12 +1887,68 @@ if FLASK_AVAILABLE:
     log.setLevel(logging.ERROR)
     
     app = Flask(__name__)
+    
+    if ORJSON_AVAILABLE:
+        try:
+            from flask.json.provider import DefaultJSONProvider
+        except ImportError:
+            # Flask 2.2 以下没有 JSONProvider，继续使用默认实现
+            DefaultJSONProvider = None
+        
+        if DefaultJSONProvider is not None:
+            class OrjsonProvider(DefaultJSONProvider):
+                """使用 orjson 序列化的 Flask JSON 提供器，orjson 无法满足的参数或类型回退到默认实现"""
+                
+                # orjson 可以等价处理的 json.dumps 参数（ensure_ascii 只影响转义形式，不影响JSON内容）
+                _ORJSON_KWARGS = {'sort_keys', 'indent', 'separators', 'ensure_ascii'}
+                
+                def dumps(self, obj, **kwargs):
+                    indent = kwargs.get('indent')
+                    if indent not in (None, 2) or not self._ORJSON_KWARGS.issuperset(kwargs):
+                        return super().dumps(obj, **kwargs)
+                    
+                    option = orjson.OPT_NON_STR_KEYS
+                    if kwargs.get('sort_keys', self.sort_keys):
+                        option |= orjson.OPT_SORT_KEYS
+                    if indent == 2:
+                        option |= orjson.OPT_INDENT_2
+                    try:
+                        return orjson.dumps(obj, option=option).decode('utf-8')
+                    except TypeError:
+                        return super().dumps(obj, **kwargs)
+            
+            app.json = OrjsonProvider(app)
     app.config['SECRET_KEY'] = 'minecraft-server-manager-secret-key'
     app.config['DEBUG'] = FLASK_DEBUG
     
     # 全局管理器实例
     manager = None
     
+    # ETag 前缀：每次启动不同，避免重启后版本号重复导致浏览器使用旧缓存
+    ETAG_PREFIX = secrets.token_hex(4)
+    
+    # 复用的紧凑JSON编码器（无状态，可多线程共享），用于高频轮询接口
+    _fast_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    
+    def fast_jsonify(obj):
+        """快速生成JSON响应：优先使用 orjson，否则复用编码器、紧凑输出，跳过 jsonify 的参数处理"""
+        if ORJSON_AVAILABLE:
+            body = orjson.dumps(obj)
+        else:
+            body = _fast_json_encoder.encode(obj)
+        return app.response_class(body, mimetype='application/json')
+    
+    def versioned_response(name: str, get_data):
+        """带 ETag 的响应：客户端缓存的版本与当前一致时返回 304，否则返回JSON数据"""
+        data = get_data()
+        etag = f"{ETAG_PREFIX}-{name}-{manager.data_version(name)}"
+        if etag in request.if_none_match:
+            response = app.response_class(status=304)
+        else:
+            response = jsonify(data)
+        response.set_etag(etag)
+        return response
+    
     @app.route('/')
     def index():
         """主页"""
@@ -1246,7 +1972,7 @@ if FLASK_AVAILABLE:
             "difficulty": manager.properties.get('difficulty', 'easy'),
             "level_name": manager.properties.get('level-name', 'world'),
         })
-        return jsonify(status)
+        return fast_jsonify(status)
     
     @app.route('/api/server/start', methods=['POST'])
     def api_start_server():
@@ -1292,10 +2018,7 @@ if FLASK_AVAILABLE:
     @app.route('/api/command-output')
     def api_command_output():
         """获取命令输出"""
-        with manager.command_output_lock:
-            output = manager.command_output_queue.copy()
-            manager.command_output_queue.clear()
-        return jsonify(output)
+        return fast_jsonify(manager.take_command_output())
     
     @app.route('/api/config', methods=['GET', 'POST'])
     def api_config():
@@ -1303,18 +2026,14 @@ if FLASK_AVAILABLE:
         if request.method == 'GET':
             return jsonify(manager.properties)
         elif request.method == 'POST':
-            data = request.json
-            results = []
-            for key, value in data.items():
-                result = manager.update_property(key, value)
-                results.append(result)
+            results = manager.update_properties(request.json)
             return jsonify(results)
     
     @app.route('/api/whitelist', methods=['GET', 'POST', 'DELETE'])
     def api_whitelist():
         """白名单管理"""
         if request.method == 'GET':
-            return jsonify(manager.whitelist)
+            return versioned_response('whitelist', lambda: manager.whitelist)
         elif request.method == 'POST':
             data = request.json
             result = manager.add_to_whitelist(data.get('name', ''))
@@ -1328,7 +2047,7 @@ if FLASK_AVAILABLE:
     def api_ops():
         """管理员管理"""
         if request.method == 'GET':
-            return jsonify(manager.ops)
+            return versioned_response('ops', lambda: manager.ops)
         elif request.method == 'POST':
             data = request.json
             result = manager.add_op(data.get('name', ''), data.get('level', 4))
@@ -1342,7 +2061,7 @@ if FLASK_AVAILABLE:
     def api_banned_players():
         """封禁玩家管理"""
         if request.method == 'GET':
-            return jsonify(manager.banned_players)
+            return versioned_response('banned_players', lambda: manager.banned_players)
         elif request.method == 'POST':
             data = request.json
             result = manager.ban_player(data.get('name', ''), data.get('reason', ''))
@@ -1356,7 +2075,7 @@ if FLASK_AVAILABLE:
     def api_banned_ips():
         """封禁IP管理"""
         if request.method == 'GET':
-            return jsonify(manager.banned_ips)
+            return versioned_response('banned_ips', lambda: manager.banned_ips)
         elif request.method == 'POST':
             data = request.json
             result = manager.ban_ip(data.get('ip', ''), data.get('reason', ''))
@@ -1370,7 +2089,7 @@ if FLASK_AVAILABLE:
     def api_mods():
         """Mod管理"""
         if request.method == 'GET':
-            return jsonify(manager.get_mods_list())
+            return versioned_response('mods', manager.get_mods_list)
         elif request.method == 'POST':
             data = request.json
             result = manager.add_mod(data.get('path', ''))
@@ -1389,13 +2108,13 @@ if FLASK_AVAILABLE:
             print(f"[DEBUG] API: /api/logs?lines={lines}")
             print(f"[DEBUG] 日志文件存在: {(manager.logs_dir / 'unified.log').exists()}")
         
-        return jsonify(manager.get_latest_logs(lines))
+        return fast_jsonify(manager.get_latest_logs(lines))
     
     @app.route('/api/backups', methods=['GET', 'POST', 'DELETE'])
     def api_backups():
         """备份管理"""
         if request.method == 'GET':
-            return jsonify(manager.get_backups_list())
+            return versioned_response('backups', manager.get_backups_list)
         elif request.method == 'POST':
             result = manager.backup_world()
             return jsonify(result)
@@ -1449,63 +2168,59 @@ if FLASK_AVAILABLE:
         return jsonify(result)
 
 
-def check_port_in_use(port: int) -> Tuple[bool, Optional[int]]:
-    """检查端口是否被占用，返回 (是否占用, 占用进程PID)"""
-    try:
-        import psutil
-        for conn in psutil.net_connections():
-            if conn.laddr.port == port and conn.status == 'LISTEN':
-                return True, conn.pid
-        return False, None
-    except (ImportError, PermissionError) as e:
-        # 如果没有 psutil 或权限不足，使用备用方法
-        return check_port_in_use_fallback(port)
+# 监听端口表缓存：{端口: PID}，1秒内复用同一次 net_connections 结果
+LISTEN_PORT_CACHE_TTL = 1.0
+_listen_port_cache: Dict[str, object] = {"time": 0.0, "map": {}}
+_listen_port_cache_lock = threading.Lock()
 
 
-def check_port_in_use_fallback(port: int) -> Tuple[bool, Optional[int]]:
-    """备用方法：使用 netstat 或 ss 检查端口"""
-    # 方法1: 尝试直接绑定端口
-    try:
-        import socket
-        test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        test_socket.settimeout(1)
-        result = test_socket.connect_ex(('127.0.0.1', port))
-        test_socket.close()
-        if result == 0:
-            # 端口被占用，尝试获取PID
-            return get_pid_by_port(port)
-        return False, None
-    except:
-        pass
+def get_listen_port_map() -> Dict[int, Optional[int]]:
+    """一次性获取所有TCP监听端口到PID的映射（带1秒缓存），psutil 不可用时抛出 ImportError"""
+    if not PSUTIL_AVAILABLE:
+        raise ImportError("psutil 未安装")
+    with _listen_port_cache_lock:
+        now = time.monotonic()
+        if now - _listen_port_cache["time"] < LISTEN_PORT_CACHE_TTL:
+            return _listen_port_cache["map"]
+        listen_map = {
+            conn.laddr.port: conn.pid
+            for conn in psutil.net_connections(kind='tcp')
+            if conn.status == psutil.CONN_LISTEN
+        }
+        _listen_port_cache["time"] = now
+        _listen_port_cache["map"] = listen_map
+        return listen_map
+
+
+def is_port_bindable(port: int, host: str = '') -> bool:
+    """尝试绑定端口判断是否空闲（微秒级，无需子进程）
     
-    # 方法2: 使用 ss 命令
+    端口被占用时返回 False；其他绑定错误（如无权限绑定特权端口、监听地址无效）直接抛出 OSError。
+    """
+    test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
-        result = subprocess.run(
-            ['ss', '-tuln'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if f':{port}' in result.stdout:
-            return get_pid_by_port(port)
+        test_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        test_socket.bind((host, port))
+        return True
+    except OSError as e:
+        if e.errno == errno.EADDRINUSE:
+            return False
+        raise
+    finally:
+        test_socket.close()
+
+
+def check_port_in_use(port: int, host: str = '') -> Tuple[bool, Optional[int]]:
+    """检查端口是否被占用，返回 (是否占用, 占用进程PID)，端口无法绑定的其他原因抛出 OSError"""
+    # 先尝试绑定端口，能绑定说明端口空闲，无需再查询进程
+    if is_port_bindable(port, host):
         return False, None
-    except:
-        pass
-    
-    # 方法3: 使用 netstat 命令
     try:
-        result = subprocess.run(
-            ['netstat', '-tuln'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if f':{port}' in result.stdout:
-            return get_pid_by_port(port)
-        return False, None
-    except:
-        # 如果所有方法都失败，假设端口可用
-        return False, None
+        listen_map = get_listen_port_map()
+        return True, listen_map.get(port)
+    except Exception:
+        # 如果没有 psutil 或权限不足（如 AccessDenied），使用其他方法获取PID
+        return get_pid_by_port(port)
 
 
 def get_pid_by_port(port: int) -> Tuple[bool, Optional[int]]:
@@ -1523,24 +2238,11 @@ def get_pid_by_port(port: int) -> Tuple[bool, Optional[int]]:
     except:
         pass
     
-    # 方法2: 尝试使用 psutil 遍历进程（避免 net_connections 权限问题）
+    # 方法2: 复用 psutil 监听端口表（一次 net_connections 调用，按端口直接查找）
     try:
-        import psutil
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                # 尝试获取连接信息
-                try:
-                    connections = proc.net_connections()
-                    for conn in connections:
-                        if conn.laddr.port == port and conn.status == 'LISTEN':
-                            return True, conn.pid
-                except (psutil.AccessDenied, psutil.NoSuchProcess, PermissionError):
-                    # 如果无法获取连接信息，尝试通过进程名判断
-                    if 'python' in proc.info.get('name', '').lower() or 'flask' in proc.info.get('name', '').lower():
-                        # 可能是我们的程序，返回这个PID
-                        return True, proc.info['pid']
-            except:
-                continue
+        listen_map = get_listen_port_map()
+        if listen_map.get(port):
+            return True, listen_map[port]
     except:
         pass
     
@@ -1637,7 +2339,12 @@ def main():
     
     # 检查端口是否被占用（使用配置中的端口）
     port = FLASK_PORT
-    is_in_use, pid = check_port_in_use(port)
+    try:
+        is_in_use, pid = check_port_in_use(port, FLASK_HOST)
+    except OSError as e:
+        print(f"\n{Colors.FAIL}✗ 无法监听 {FLASK_HOST}:{port}: {e}{Colors.ENDC}")
+        print(f"{Colors.WARNING}请检查 FLASK_HOST / FLASK_PORT 配置{Colors.ENDC}")
+        sys.exit(1)
     
     if is_in_use:
         print(f"\n{Colors.WARNING}警告: 端口 {port} 已被占用！{Colors.ENDC}")
@@ -1676,7 +2383,6 @@ def main():
     
     # 启动Flask服务器
     try:
-        import threading
         import webbrowser
         
         # 在新线程中打开浏览器
@@ -1690,7 +2396,7 @@ def main():
         app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}正在关闭服务器...{Colors.ENDC}")
-        if manager.server_process and manager.server_process.poll() is None:
+        if manager._is_running():
             manager.stop_server()
         print(f"{Colors.OKGREEN}✓ 服务器管理端已关闭{Colors.ENDC}")
 